@@ -1,9 +1,14 @@
-from flask import Flask, render_template, request, redirect, url_for, session, flash
+from flask import Flask, Response, render_template, request, redirect, url_for, session, flash
 from werkzeug.security import check_password_hash, generate_password_hash
+import json
 import os
 
+import live_progress
+
 app = Flask(__name__)
 app.secret_key = os.environ.get("FLASK_SECRET", "dev-secret")
+app.config["PYTEST_LOG"] = os.environ.get("PYTEST_LOG", live_progress.PYTEST_LOG)
+app.config["SSE_HEARTBEAT"] = 15
 
 USERS = {"alice": generate_password_hash("password123")}
 
@@ -32,6 +37,34 @@ def dashboard():
         return redirect(url_for("login"))
     return render_template("dashboard.html", username=session.get("user"))
 
+@app.route("/dashboard/live")
+def live_dashboard():
+    if not session.get("user"):
+        return redirect(url_for("login"))
+    return render_template("live_dashboard.html", username=session.get("user"))
+
+@app.route("/dashboard/events")
+def dashboard_events():
+    if not session.get("user"):
+        return redirect(url_for("login"))
+
+    broadcaster = live_progress.get_broadcaster(app.config["PYTEST_LOG"])
+    heartbeat = app.config["SSE_HEARTBEAT"]
+
+    def stream():
+        # All clients share one tailer; each one only keeps its own cursor
+        seq, run, failures_seen = -1, None, 0
+        while True:
+            new_seq, event = broadcaster.wait(seq, run, failures_seen, timeout=heartbeat)
+            if new_seq == seq:
+                yield ": keep-alive\n\n"
+                continue
+            seq, run, failures_seen = new_seq, event["run"], event["total_failures"]
+            yield f"event: progress\ndata: {json.dumps(event)}\n\n"
+
+    return Response(stream(), mimetype="text/event-stream",
+                    headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"})
+
 @app.route("/logout")
 def logout():
     session.clear()
@@ -0,0 +1,439 @@
+import os
+import sys
+import json
+import time
+import runpy
+import shutil
+import argparse
+import platform
+import statistics
+import tempfile
+import threading
+import socketserver
+import multiprocessing
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+try:
+    import psutil
+except ImportError:
+    psutil = None
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+REPO_DIR = os.path.dirname(os.path.abspath(__file__))
+STAGES = ['generate_report', 'send_report_email', 'publish_report_confluence']
+BASELINE_FILE = os.path.join('benchmarks', 'reporting_baseline.json')
+RESULTS_FILE = os.path.join('report', 'benchmark_results.json')
+
+# Metrics that vary run to run are compared with a tolerance, counts must not grow
+TOLERANCE_METRICS = ['wall_time_s', 'peak_rss_bytes', 'bytes_read', 'bytes_written']
+COUNT_METRICS = ['http_round_trips', 'smtp_round_trips']
+# Wall-time increases below this are treated as timer/scheduler jitter
+MIN_TIME_DELTA_S = 0.05
+
+
+# ----------------------------
+# Synthetic Report Generator
+# ----------------------------
+def generate_synthetic_report(report_dir, tests, failures, size_mb):
+    """Write a pytest-html style report.html and a matching pytest_output.txt."""
+    os.makedirs(report_dir, exist_ok=True)
+    failures = min(failures, tests)
+    passed = tests - failures
+
+    header = (
+        "<!DOCTYPE html>\n<html><head><meta charset='utf-8'><title>report.html</title></head>\n"
+        "<body><h1>report.html</h1>\n"
+        f"<p>{tests} tests ran in 1.00 seconds.</p>\n"
+        f"<p>{passed} Passed, 0 Skipped, {failures} Failed, 0 Errors</p>\n"
+        "<table id='results-table'>\n"
+    )
+    footer = "</table>\n</body></html>\n"
+    row = "<tr class='{cls}'><td>{result}</td><td>tests/test_bench.py::test_{i}</td><td><div class='log'>{log}</div></td></tr>\n"
+
+    base_size = len(header) + len(footer) + tests * len(row.format(cls='passed', result='Passed', i=tests, log=''))
+    pad = max(0, int(size_mb * 1024 * 1024) - base_size) // max(tests, 1)
+
+    with open(os.path.join(report_dir, 'report.html'), 'w', encoding='utf-8') as f:
+        f.write(header)
+        for i in range(tests):
+            failed = i < failures
+            f.write(row.format(cls='failed' if failed else 'passed',
+                               result='Failed' if failed else 'Passed',
+                               i=i, log='x' * pad))
+        f.write(footer)
+
+    with open(os.path.join(report_dir, 'pytest_output.txt'), 'w', encoding='utf-8') as f:
+        f.write(f"collected {tests} items\n\n")
+        # Like pytest at 80 columns: file name on the first line only, then wrapped
+        # lines, each padded to the right-aligned "[ NN%]" progress suffix
+        outcomes = 'F' * failures + '.' * passed
+        line, done = "tests/test_bench.py ", 0
+        for c in outcomes:
+            line += c
+            done += 1
+            if len(line) == 73 or done == tests:
+                f.write(f"{line:<73} [{done * 100 // tests:3d}%]\n")
+                line = ""
+        f.write("\n=========================== short test summary info ============================\n")
+        for i in range(failures):
+            f.write(f"FAILED tests/test_bench.py::test_{i} - AssertionError\n")
+        f.write(f"========================= {failures} failed, {passed} passed in 1.00s =========================\n")
+
+
+# ----------------------------
+# Local Confluence REST Stub
+# ----------------------------
+class ConfluenceStub(ThreadingHTTPServer):
+    """Answers the Confluence REST calls made by publish_report_confluence.py."""
+
+    daemon_threads = True
+
+    def __init__(self):
+        super().__init__(('127.0.0.1', 0), ConfluenceHandler)
+        self.lock = threading.Lock()
+        self.next_id = 1000
+        self.reset()
+
+    def reset(self):
+        with self.lock:
+            self.round_trips = 0
+            self.bytes_in = 0
+            self.bytes_out = 0
+
+    @property
+    def base_url(self):
+        return f"http://127.0.0.1:{self.server_address[1]}"
+
+
+class ConfluenceHandler(BaseHTTPRequestHandler):
+    def log_message(self, format, *args):
+        pass
+
+    def _reply(self, payload):
+        body = self.rfile.read(int(self.headers.get('Content-Length', 0)))
+        data = json.dumps(payload).encode('utf-8')
+        # Count before replying: the client may exit as soon as it has the response
+        with self.server.lock:
+            self.server.round_trips += 1
+            self.server.bytes_in += len(body)
+            self.server.bytes_out += len(data)
+
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def _new_id(self):
+        with self.server.lock:
+            self.server.next_id += 1
+            return str(self.server.next_id)
+
+    def do_POST(self):
+        if self.path.endswith('/child/attachment'):
+            self._reply({"results": [{"id": f"att{self._new_id()}"}]})
+        else:
+            self._reply({"id": self._new_id()})
+
+    def do_PUT(self):
+        self._reply({"id": self.path.rstrip('/').rsplit('/', 1)[-1]})
+
+
+# ----------------------------
+# Local SMTP Sink
+# ----------------------------
+class SmtpSink(socketserver.ThreadingTCPServer):
+    """Accepts plain SMTP sessions and discards the messages."""
+
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(self):
+        super().__init__(('127.0.0.1', 0), SmtpHandler)
+        self.lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self.lock:
+            self.round_trips = 0
+            self.bytes_in = 0
+            self.messages = 0
+
+    @property
+    def port(self):
+        return self.server_address[1]
+
+
+class SmtpHandler(socketserver.StreamRequestHandler):
+    def _reply(self, line, received):
+        with self.server.lock:
+            self.server.round_trips += 1
+            self.server.bytes_in += received
+        self.wfile.write(line.encode('ascii') + b"\r\n")
+
+    def handle(self):
+        self.wfile.write(b"220 localhost benchmark sink\r\n")
+        while True:
+            line = self.rfile.readline()
+            if not line:
+                return
+            command = line[:4].upper()
+            if command == b'DATA':
+                self._reply("354 End data with <CR><LF>.<CR><LF>", len(line))
+                size = 0
+                while (chunk := self.rfile.readline()) and chunk != b".\r\n":
+                    size += len(chunk)
+                with self.server.lock:
+                    self.server.messages += 1
+                self._reply("250 OK: queued", size)
+            elif command == b'QUIT':
+                self._reply("221 Bye", len(line))
+                return
+            elif command in (b'EHLO', b'HELO', b'MAIL', b'RCPT', b'RSET', b'NOOP'):
+                self._reply("250 OK", len(line))
+            else:
+                self._reply("502 Command not implemented", len(line))
+
+
+# ----------------------------
+# Per-process Resource Probes
+# ----------------------------
+def _peak_rss():
+    if psutil:
+        mem = psutil.Process().memory_info()
+        if hasattr(mem, 'peak_wset'):  # Windows
+            return mem.peak_wset
+    if resource:
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak if sys.platform == 'darwin' else peak * 1024
+    return None
+
+
+def _io_counters():
+    """Bytes read/written by this process as reported by the OS (None if unavailable)."""
+    if psutil:
+        try:
+            io = psutil.Process().io_counters()
+            return (getattr(io, 'read_chars', io.read_bytes), getattr(io, 'write_chars', io.write_bytes))
+        except (AttributeError, psutil.Error):
+            pass
+    try:
+        with open('/proc/self/io') as f:
+            fields = dict(line.split(': ') for line in f.read().splitlines())
+        return int(fields['rchar']), int(fields['wchar'])
+    except (OSError, KeyError, ValueError):
+        return None
+
+
+def _run_stage(stage, workdir, env, conn):
+    """Child process entry point: run one pipeline script exactly as Jenkins does."""
+    os.chdir(workdir)
+    os.environ.update(env)
+    sys.path.insert(0, REPO_DIR)
+
+    result = {'exit_code': 0, 'error': None}
+    io_before = _io_counters()
+    start = time.perf_counter()
+    with open(os.devnull, 'w', encoding='utf-8') as devnull:
+        stdout = sys.stdout
+        sys.stdout = devnull
+        try:
+            runpy.run_path(os.path.join(REPO_DIR, f"{stage}.py"), run_name='__main__')
+        except SystemExit as e:
+            if e.code not in (None, 0):
+                result['exit_code'] = e.code if isinstance(e.code, int) else 1
+                result['error'] = None if isinstance(e.code, int) else str(e.code)
+        except Exception as e:
+            result['exit_code'] = 1
+            result['error'] = str(e)
+        finally:
+            sys.stdout = stdout
+    result['wall_time_s'] = round(time.perf_counter() - start, 4)
+    io_after = _io_counters()
+
+    result['peak_rss_bytes'] = _peak_rss()
+    if io_before and io_after:
+        result['bytes_read'] = io_after[0] - io_before[0]
+        result['bytes_written'] = io_after[1] - io_before[1]
+    else:
+        result['bytes_read'] = result['bytes_written'] = None
+    conn.send(result)
+    conn.close()
+
+
+# ----------------------------
+# Benchmark Runner
+# ----------------------------
+def _run_stage_once(ctx, stage, workdir, env, confluence, smtp):
+    confluence.reset()
+    smtp.reset()
+
+    parent_conn, child_conn = ctx.Pipe(duplex=False)
+    proc = ctx.Process(target=_run_stage, args=(stage, workdir, env, child_conn))
+    proc.start()
+    child_conn.close()
+    try:
+        result = parent_conn.recv()
+    except EOFError:
+        result = {'exit_code': proc.exitcode, 'error': 'stage process died'}
+    proc.join()
+
+    result['http_round_trips'] = confluence.round_trips
+    result['http_bytes_sent'] = confluence.bytes_in
+    result['smtp_round_trips'] = smtp.round_trips
+    result['smtp_bytes_sent'] = smtp.bytes_in
+    result['smtp_messages'] = smtp.messages
+    return result
+
+
+def _summarize(samples):
+    """Median of the measured metrics over repeated runs; counts must agree so take the max."""
+    result = dict(samples[-1])
+    failed = [s for s in samples if s.get('exit_code')]
+    if failed:
+        result.update(exit_code=failed[0]['exit_code'], error=failed[0].get('error'))
+    for key in TOLERANCE_METRICS:
+        values = [s[key] for s in samples if s.get(key) is not None]
+        result[key] = statistics.median(values) if values else None
+    for key in COUNT_METRICS + ['smtp_messages']:
+        result[key] = max(s.get(key) or 0 for s in samples)
+    result['wall_time_samples'] = [s.get('wall_time_s') for s in samples]
+    return result
+
+
+def run_benchmark(tests=200, failures=10, size_mb=1.0, repeat=1):
+    """Run every reporting stage `repeat` times against the local stubs and return the medians."""
+    confluence = ConfluenceStub()
+    smtp = SmtpSink()
+    for server in (confluence, smtp):
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+
+    env = {
+        'CONFLUENCE_BASE': confluence.base_url,
+        'CONFLUENCE_USER': 'bench',
+        'CONFLUENCE_TOKEN': 'bench',
+        'CONFLUENCE_SPACE': 'BENCH',
+        'CONFLUENCE_TITLE': 'Benchmark Report',
+        'SMTP_HOST': '127.0.0.1',
+        'SMTP_PORT': str(smtp.port),
+        'SMTP_USER': '',
+        'SMTP_PASS': '',
+        'REPORT_FROM': 'bench@localhost',
+        'REPORT_TO': 'bench@localhost',
+        'MPLBACKEND': 'Agg',
+    }
+
+    workdir = tempfile.mkdtemp(prefix='report_bench_')
+    ctx = multiprocessing.get_context('spawn')
+    stages = {}
+    try:
+        generate_synthetic_report(os.path.join(workdir, 'report'), tests, failures, size_mb)
+        for stage in STAGES:
+            samples = [_run_stage_once(ctx, stage, workdir, env, confluence, smtp)
+                       for _ in range(max(repeat, 1))]
+            stages[stage] = result = _summarize(samples)
+            print(f"⏱ {stage}: {result.get('wall_time_s')}s (median of {len(samples)}), "
+                  f"{result['http_round_trips']} HTTP / {result['smtp_round_trips']} SMTP round trips")
+    finally:
+        confluence.shutdown()
+        smtp.shutdown()
+        confluence.server_close()
+        smtp.server_close()
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    return {
+        'params': {'tests': tests, 'failures': failures, 'size_mb': size_mb},
+        'repeat': max(repeat, 1),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'stages': stages,
+    }
+
+
+# ----------------------------
+# Baseline Comparison
+# ----------------------------
+def compare_to_baseline(results, baseline, tolerance=0.25, min_time_delta=MIN_TIME_DELTA_S):
+    """Return a list of human readable regressions against a saved baseline."""
+    regressions = []
+    if baseline.get('params') != results['params']:
+        regressions.append(f"parameters differ from baseline: {baseline.get('params')} vs {results['params']}")
+        return regressions
+
+    for stage, metrics in results['stages'].items():
+        base = baseline['stages'].get(stage)
+        if base is None:
+            continue
+        if metrics.get('exit_code'):
+            regressions.append(f"{stage}: exited with code {metrics['exit_code']} ({metrics.get('error')})")
+        for key in TOLERANCE_METRICS:
+            old, new = base.get(key), metrics.get(key)
+            if key == 'wall_time_s' and new is not None and old is not None and new - old < min_time_delta:
+                continue
+            if old and new is not None and new > old * (1 + tolerance):
+                regressions.append(f"{stage}: {key} {old} -> {new} (+{(new / old - 1) * 100:.0f}%)")
+        for key in COUNT_METRICS:
+            old, new = base.get(key), metrics.get(key)
+            if old is not None and new is not None and new > old:
+                regressions.append(f"{stage}: {key} {old} -> {new}")
+    return regressions
+
+
+def save_json(path, data):
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, indent=2)
+        f.write('\n')
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the report / email / Confluence pipeline locally.")
+    parser.add_argument('--tests', type=int, default=200, help="number of synthetic tests")
+    parser.add_argument('--failures', type=int, default=10, help="number of failing tests")
+    parser.add_argument('--size-mb', type=float, default=1.0, help="size of the synthetic report.html")
+    parser.add_argument('--output', default=RESULTS_FILE, help="where to write this run's results")
+    parser.add_argument('--baseline', default=BASELINE_FILE, help="baseline JSON to compare against")
+    parser.add_argument('--repeat', type=int, default=3, help="runs per stage; medians are compared")
+    parser.add_argument('--tolerance', type=float, default=0.25, help="allowed growth for time/memory/IO metrics")
+    parser.add_argument('--update-baseline', action='store_true', help="save this run as the new baseline")
+    args = parser.parse_args(argv)
+
+    results = run_benchmark(args.tests, args.failures, args.size_mb, args.repeat)
+    save_json(args.output, results)
+    print(f"📄 Results written to {args.output}")
+
+    failed = [s for s, m in results['stages'].items() if m.get('exit_code')]
+    if failed:
+        print(f"❌ Stages failed: {', '.join(failed)}")
+        return 1
+
+    if args.update_baseline:
+        save_json(args.baseline, results)
+        print(f"📌 Baseline updated: {args.baseline}")
+        return 0
+
+    if not os.path.exists(args.baseline):
+        print(f"⚪ No baseline at {args.baseline}; run with --update-baseline to create one.")
+        return 0
+
+    with open(args.baseline, encoding='utf-8') as f:
+        baseline = json.load(f)
+    regressions = compare_to_baseline(results, baseline, args.tolerance)
+    if regressions:
+        print("❌ Performance regressions:")
+        for r in regressions:
+            print(f"   - {r}")
+        return 1
+    print("✅ No regressions against baseline.")
+    return 0
+
+
+# ----------------------------
+# Entry Point
+# ----------------------------
+if __name__ == "__main__":
+    sys.exit(main())
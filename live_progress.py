@@ -0,0 +1,198 @@
+import os
+import re
+import threading
+
+PYTEST_LOG = os.path.join('report', 'pytest_output.txt')
+POLL_INTERVAL = 0.5
+READ_CHUNK = 1024 * 1024
+
+# "tests/test_app.py ..F.s   [ 80%]" (default output, written char by char)
+PROGRESS_LINE = re.compile(r'^(\S+\.py) ([.FEsxX]+)')
+# "....F.......   [ 83%]" (same file, wrapped onto the next line)
+CONTINUATION_LINE = re.compile(r'^([.FEsxX]+)(?:\s+\[\s*\d+%\])?\s*$')
+# "tests/test_app.py::test_x[a b] PASSED   [ 25%]" (pytest -v)
+VERBOSE_LINE = re.compile(r'^(\S+::.+) (PASSED|FAILED|ERROR|SKIPPED|XFAIL|XPASS)\b')
+# "FAILED tests/test_app.py::test_x[a b] - AssertionError" (short summary)
+SHORT_SUMMARY_LINE = re.compile(r'^(FAILED|ERROR) (\S+::.+?)(?: - |\s*$)')
+# "==== 1 failed, 3 passed in 0.52s ====" (final summary)
+FINAL_LINE = re.compile(r'^=+ (.+) in [\d.]+s\b.*=+$')
+FINAL_COUNT = re.compile(r'(\d+) (passed|failed|skipped|errors?)')
+
+CHAR_OUTCOMES = {'.': 'passed', 'F': 'failed', 'E': 'error', 's': 'skipped'}
+WORD_OUTCOMES = {'PASSED': 'passed', 'FAILED': 'failed', 'ERROR': 'error', 'SKIPPED': 'skipped'}
+
+
+# ----------------------------
+# Incremental Log Tailer
+# ----------------------------
+class LogTailer:
+    """Follow a growing pytest log by byte offset and keep running counts."""
+
+    def __init__(self, path=PYTEST_LOG):
+        self.path = path
+        self.run = 0
+        self.reset()
+
+    def reset(self):
+        self.run += 1
+        self.offset = 0
+        self.counts = {'passed': 0, 'failed': 0, 'skipped': 0, 'error': 0}
+        self.failures = []
+        self.finished = False
+        self._seen_failures = set()
+        self._partial = b''
+        self._partial_counted = 0
+        self._in_progress = False
+
+    def poll(self):
+        """Read only the bytes appended since the last call. Returns True if anything changed."""
+        try:
+            size = os.path.getsize(self.path)
+        except OSError:
+            return False
+
+        changed = False
+        if size < self.offset:
+            # Log was truncated / rewritten by a new run
+            self.reset()
+            changed = True
+        if size == self.offset:
+            return changed
+
+        # Bounded reads so a large backlog (e.g. after a restart) is never loaded at once
+        with open(self.path, 'rb') as f:
+            f.seek(self.offset)
+            while self.offset < size:
+                chunk = f.read(min(READ_CHUNK, size - self.offset))
+                if not chunk:
+                    break
+                self.offset += len(chunk)
+                self._feed(chunk)
+
+        # Default pytest output prints progress chars before the newline arrives
+        pending = self._partial.decode('utf-8', errors='ignore')
+        if (chars := self._progress_chars(pending)) is not None:
+            self._count_progress(chars[self._partial_counted:])
+            self._partial_counted = len(chars)
+        return True
+
+    def _feed(self, chunk):
+        *lines, self._partial = (self._partial + chunk).split(b'\n')
+        for raw in lines:
+            line = raw.decode('utf-8', errors='ignore').rstrip('\r')
+            self._parse_line(line, self._partial_counted)
+            self._partial_counted = 0
+
+    def _progress_chars(self, line):
+        """Outcome characters of a progress line or of its wrapped continuation."""
+        if m := PROGRESS_LINE.match(line):
+            return m.group(2)
+        if self._in_progress and (m := CONTINUATION_LINE.match(line)):
+            return m.group(1)
+        return None
+
+    def _parse_line(self, line, already_counted):
+        chars = self._progress_chars(line)
+        self._in_progress = chars is not None
+        if chars is not None:
+            self._count_progress(chars[already_counted:])
+        elif m := VERBOSE_LINE.match(line):
+            outcome = WORD_OUTCOMES.get(m.group(2))
+            if outcome:
+                self.counts[outcome] += 1
+            if outcome in ('failed', 'error'):
+                self._add_failure(m.group(1))
+        elif m := SHORT_SUMMARY_LINE.match(line):
+            self._add_failure(m.group(2))
+        elif m := FINAL_LINE.match(line):
+            final = {'passed': 0, 'failed': 0, 'skipped': 0, 'error': 0}
+            for count, label in FINAL_COUNT.findall(m.group(1)):
+                final['error' if label.startswith('error') else label] = int(count)
+            self.counts = final
+            self.finished = True
+
+    def _count_progress(self, chars):
+        for c in chars:
+            outcome = CHAR_OUTCOMES.get(c)
+            if outcome:
+                self.counts[outcome] += 1
+
+    def _add_failure(self, node_id):
+        if node_id not in self._seen_failures:
+            self._seen_failures.add(node_id)
+            self.failures.append(node_id)
+
+
+# ----------------------------
+# Fan-out Broadcaster
+# ----------------------------
+class ProgressBroadcaster:
+    """Run a single tailer thread and share its results with every connected client."""
+
+    def __init__(self, path=PYTEST_LOG, interval=POLL_INTERVAL):
+        self.tailer = LogTailer(path)
+        self.interval = interval
+        self.seq = 0
+        self._cond = threading.Condition()
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self):
+        with self._cond:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, daemon=True)
+                self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+
+    def _run(self):
+        while not self._stop.is_set():
+            self.poll()
+            self._stop.wait(self.interval)
+
+    def poll(self):
+        """Advance the tailer once and wake waiting clients if it produced news."""
+        with self._cond:
+            if self.tailer.poll():
+                self.seq += 1
+                self._cond.notify_all()
+
+    def wait(self, last_seq, run=None, failures_seen=0, timeout=None):
+        """
+        Block until there is an update newer than last_seq (or timeout).
+        Returns (seq, event) where event holds the counts and only the failures
+        the caller has not seen yet. A caller without a run (new connection) or
+        from an older run gets a snapshot with the full failure list.
+        """
+        with self._cond:
+            self._cond.wait_for(lambda: self.seq != last_seq, timeout=timeout)
+            failures = self.tailer.failures
+            snapshot = run != self.tailer.run
+            if snapshot:
+                failures_seen = 0
+            event = {
+                'run': self.tailer.run,
+                'snapshot': snapshot,
+                'counts': dict(self.tailer.counts),
+                'new_failures': failures[failures_seen:],
+                'total_failures': len(failures),
+                'finished': self.tailer.finished,
+            }
+            return self.seq, event
+
+
+_broadcasters = {}
+_broadcasters_lock = threading.Lock()
+
+
+def get_broadcaster(path=PYTEST_LOG):
+    """Return the shared broadcaster for a log file, starting it on first use."""
+    path = os.path.abspath(path)
+    with _broadcasters_lock:
+        broadcaster = _broadcasters.get(path)
+        if broadcaster is None:
+            broadcaster = _broadcasters[path] = ProgressBroadcaster(path)
+            broadcaster.poll()  # first clients see what is already in the log
+            broadcaster.start()
+    return broadcaster
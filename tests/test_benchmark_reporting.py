@@ -0,0 +1,118 @@
+import re
+import smtplib
+import threading
+
+import pytest
+import requests
+
+from benchmark_reporting import (
+    ConfluenceStub, SmtpSink, compare_to_baseline, generate_synthetic_report, run_benchmark,
+)
+
+
+@pytest.fixture
+def server():
+    """Run a stub server in the background for the duration of a test."""
+    started = []
+
+    def start(srv):
+        threading.Thread(target=srv.serve_forever, daemon=True).start()
+        started.append(srv)
+        return srv
+
+    yield start
+    for srv in started:
+        srv.shutdown()
+        srv.server_close()
+
+
+def test_synthetic_report_matches_requested_shape(tmp_path):
+    """✅ The synthetic report has the requested size and summary counts."""
+    generate_synthetic_report(str(tmp_path), tests=50, failures=3, size_mb=0.5)
+    html = (tmp_path / "report.html").read_text(encoding="utf-8")
+    log = (tmp_path / "pytest_output.txt").read_text(encoding="utf-8")
+
+    assert abs(len(html) - 512 * 1024) < 1024
+    assert "47 Passed, 0 Skipped, 3 Failed, 0 Errors" in html
+    assert "3 failed, 47 passed in" in log
+    assert log.count("FAILED tests/test_bench.py::") == 3
+
+
+def test_synthetic_log_wraps_like_pytest(tmp_path):
+    """✅ Progress wraps without the file name and each line ends in a [ NN%] suffix."""
+    generate_synthetic_report(str(tmp_path), tests=200, failures=5, size_mb=0.01)
+    lines = (tmp_path / "pytest_output.txt").read_text(encoding="utf-8").splitlines()
+    progress = lines[2:lines.index("", 2)]
+
+    assert len(progress) == 4
+    assert progress[0].startswith("tests/test_bench.py FFFFF.")
+    assert all(not line.startswith("tests/") for line in progress[1:])
+    assert all(re.search(r" \[\s*\d+%\]$", line) for line in progress)
+    assert progress[-1].endswith("[100%]")
+    outcomes = "".join(re.sub(r"^tests/test_bench\.py |\s+\[\s*\d+%\]$", "", line) for line in progress)
+    assert outcomes == "F" * 5 + "." * 195
+
+
+def test_confluence_stub_counts_round_trips(server):
+    """✅ The Confluence stub answers the publish calls and counts them."""
+    stub = server(ConfluenceStub())
+    res = requests.post(f"{stub.base_url}/rest/api/content", json={"title": "x"})
+    page_id = res.json()["id"]
+    res = requests.post(f"{stub.base_url}/rest/api/content/{page_id}/child/attachment",
+                        files={"file": ("a.pdf", b"%PDF", "application/pdf")})
+    assert res.json()["results"][0]["id"]
+    requests.put(f"{stub.base_url}/rest/api/content/{page_id}", json={}).raise_for_status()
+
+    assert stub.round_trips == 3
+    assert stub.bytes_in > 0
+
+
+def test_smtp_sink_accepts_messages(server):
+    """✅ The SMTP sink accepts a message and counts every command round trip."""
+    sink = server(SmtpSink())
+    with smtplib.SMTP("127.0.0.1", sink.port) as s:
+        s.sendmail("a@localhost", ["b@localhost"], "Subject: hi\r\n\r\nbody")
+
+    assert sink.messages == 1
+    # EHLO, MAIL, RCPT, DATA, end of data, QUIT
+    assert sink.round_trips == 6
+
+
+def test_compare_to_baseline_flags_regressions():
+    """✅ Slower stages and extra round trips are reported, small noise is not."""
+    baseline = {"params": {"tests": 1}, "stages": {"publish_report_confluence": {
+        "wall_time_s": 1.0, "peak_rss_bytes": 100, "http_round_trips": 4, "smtp_round_trips": 6}}}
+    results = {"params": {"tests": 1}, "stages": {"publish_report_confluence": {
+        "exit_code": 0, "wall_time_s": 1.1, "peak_rss_bytes": 200, "http_round_trips": 5, "smtp_round_trips": 6}}}
+
+    regressions = compare_to_baseline(results, baseline, tolerance=0.25)
+    assert len(regressions) == 2
+    assert any("peak_rss_bytes" in r for r in regressions)
+    assert any("http_round_trips" in r for r in regressions)
+
+    results["params"] = {"tests": 2}
+    assert "parameters differ" in compare_to_baseline(results, baseline)[0]
+
+
+def test_compare_to_baseline_ignores_small_absolute_time_changes():
+    """✅ Millisecond jitter on a tiny stage is not a regression, a real slowdown is."""
+    baseline = {"params": {"tests": 1}, "stages": {"send_report_email": {"wall_time_s": 0.0153}}}
+    results = {"params": {"tests": 1}, "stages": {"send_report_email": {"exit_code": 0, "wall_time_s": 0.0189}}}
+    assert compare_to_baseline(results, baseline, tolerance=0.1) == []
+
+    results["stages"]["send_report_email"]["wall_time_s"] = 0.2
+    assert "wall_time_s" in compare_to_baseline(results, baseline, tolerance=0.1)[0]
+
+
+def test_run_benchmark_end_to_end():
+    """✅ All three reporting stages run against the local stand-ins."""
+    for module in ("bs4", "matplotlib", "reportlab"):
+        pytest.importorskip(module)
+
+    results = run_benchmark(tests=20, failures=2, size_mb=0.1, repeat=2)
+    stages = results["stages"]
+    assert all(len(m["wall_time_samples"]) == 2 for m in stages.values())
+    assert all(m["exit_code"] == 0 for m in stages.values())
+    assert stages["send_report_email"]["smtp_messages"] == 1
+    assert stages["publish_report_confluence"]["http_round_trips"] == 4
+    assert stages["publish_report_confluence"]["smtp_messages"] == 1
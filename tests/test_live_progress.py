@@ -0,0 +1,249 @@
+import json
+import threading
+
+import pytest
+
+import live_progress
+from app import app
+from live_progress import LogTailer, ProgressBroadcaster
+
+
+@pytest.fixture
+def log_file(tmp_path):
+    """Provide an empty pytest log that tests append to as a run would."""
+    path = tmp_path / "pytest_output.txt"
+    path.write_bytes(b"")
+    return path
+
+
+@pytest.fixture(autouse=True)
+def clean_broadcasters():
+    """Stop and forget shared broadcasters so no test inherits a dead one."""
+    yield
+    with live_progress._broadcasters_lock:
+        for broadcaster in live_progress._broadcasters.values():
+            broadcaster.stop()
+        live_progress._broadcasters.clear()
+
+
+def append(path, text):
+    with open(path, "ab") as f:
+        f.write(text.encode("utf-8"))
+
+
+# Captured from `pytest` (default output, 80 columns) on 152 tests with 4 failures
+WRAPPED_PROGRESS = (
+    "collected 152 items\n"
+    "\n"
+    "tests/test_many.py ..........F.......................................... [ 34%]\n"
+    ".................F...................................................... [ 82%]\n"
+    "...............F.........F.                                              [100%]\n"
+    "\n"
+)
+
+
+def test_tailer_counts_progress_chars_before_newline(log_file):
+    """✅ Default pytest output is counted as the dots arrive, without double counting."""
+    tailer = LogTailer(str(log_file))
+    append(log_file, "collected 5 items\n\ntests/test_app.py ..")
+    assert tailer.poll()
+    assert tailer.counts["passed"] == 2
+
+    append(log_file, "F.s")
+    tailer.poll()
+    append(log_file, "                [100%]\n")
+    tailer.poll()
+    assert tailer.counts == {"passed": 3, "failed": 1, "skipped": 1, "error": 0}
+
+
+def test_tailer_counts_wrapped_progress_lines(log_file):
+    """✅ Progress wrapped onto lines without the file name is still counted, chunk by chunk."""
+    tailer = LogTailer(str(log_file))
+    for start in range(0, len(WRAPPED_PROGRESS), 7):
+        append(log_file, WRAPPED_PROGRESS[start:start + 7])
+        tailer.poll()
+
+    assert tailer.counts == {"passed": 148, "failed": 4, "skipped": 0, "error": 0}
+    assert not tailer.finished
+
+
+def test_tailer_reads_backlog_in_bounded_chunks(log_file, monkeypatch):
+    """✅ A large backlog is consumed chunk by chunk with the same result."""
+    monkeypatch.setattr(live_progress, "READ_CHUNK", 16)
+    append(log_file, WRAPPED_PROGRESS)
+    tailer = LogTailer(str(log_file))
+    assert tailer.poll()
+
+    assert tailer.offset == log_file.stat().st_size
+    assert tailer.counts == {"passed": 148, "failed": 4, "skipped": 0, "error": 0}
+
+
+def test_tailer_reads_only_appended_bytes(log_file):
+    """✅ The tailer advances a byte offset and skips the read when nothing changed."""
+    tailer = LogTailer(str(log_file))
+    append(log_file, "tests/test_app.py::test_login PASSED   [ 50%]\n")
+    tailer.poll()
+    assert tailer.offset == log_file.stat().st_size
+    assert tailer.poll() is False
+
+    append(log_file, "tests/test_app.py::test_logout FAILED   [100%]\n")
+    assert tailer.poll()
+    assert tailer.offset == log_file.stat().st_size
+    assert tailer.counts["passed"] == 1
+    assert tailer.failures == ["tests/test_app.py::test_logout"]
+
+
+def test_tailer_final_summary_and_short_summary(log_file):
+    """✅ Short summary names failures once and the final line fixes the counts."""
+    tailer = LogTailer(str(log_file))
+    append(log_file, "tests/test_app.py ..F\r\n")
+    append(log_file, "FAILED tests/test_app.py::test_force_failure - AssertionError\r\n")
+    append(log_file, "========= 1 failed, 2 passed, 1 skipped in 0.42s =========\r\n")
+    tailer.poll()
+    assert tailer.failures == ["tests/test_app.py::test_force_failure"]
+    assert tailer.counts == {"passed": 2, "failed": 1, "skipped": 1, "error": 0}
+    assert tailer.finished
+
+
+def test_tailer_handles_node_ids_with_spaces(log_file):
+    """✅ Parametrize IDs containing spaces are counted and listed in full."""
+    tailer = LogTailer(str(log_file))
+    append(log_file, "tests/test_many.py::test_sp[a b] FAILED                                  [ 99%]\n")
+    append(log_file, "tests/test_many.py::test_sp[c] PASSED                                    [100%]\n")
+    append(log_file, "FAILED tests/test_many.py::test_sp[x y] - AssertionError: assert 'x y' != 'x y'\n")
+    append(log_file, "ERROR tests/test_many.py::test_sp[p q]\n")
+    tailer.poll()
+
+    assert tailer.counts["failed"] == 1
+    assert tailer.counts["passed"] == 1
+    assert tailer.failures == [
+        "tests/test_many.py::test_sp[a b]",
+        "tests/test_many.py::test_sp[x y]",
+        "tests/test_many.py::test_sp[p q]",
+    ]
+
+
+def test_tailer_resets_when_log_is_rewritten(log_file):
+    """✅ A shorter file means a new run: counts start again from zero."""
+    tailer = LogTailer(str(log_file))
+    append(log_file, "tests/test_app.py::test_a FAILED\ntests/test_app.py::test_b PASSED\n")
+    tailer.poll()
+    first_run = tailer.run
+
+    log_file.write_bytes(b"tests/test_app.py .\n")
+    tailer.poll()
+    assert tailer.run == first_run + 1
+    assert tailer.counts["passed"] == 1
+    assert tailer.failures == []
+
+
+def test_tailer_reports_rewrite_to_empty_log(log_file):
+    """✅ Emptying the log for a new run is itself an update clients must see."""
+    tailer = LogTailer(str(log_file))
+    append(log_file, "tests/test_app.py::test_a FAILED\n")
+    tailer.poll()
+
+    log_file.write_bytes(b"")
+    assert tailer.poll()
+    assert tailer.counts["failed"] == 0
+    assert tailer.failures == []
+    assert tailer.poll() is False
+
+
+def test_broadcaster_fans_out_one_tail(log_file, monkeypatch):
+    """✅ Many waiting clients are served by a single read of the log."""
+    broadcaster = ProgressBroadcaster(str(log_file))
+    reads = []
+    original_poll = broadcaster.tailer.poll
+    monkeypatch.setattr(broadcaster.tailer, "poll", lambda: reads.append(1) or original_poll())
+
+    seq, _ = broadcaster.wait(-1)
+    results = []
+
+    def client():
+        results.append(broadcaster.wait(seq, timeout=5))
+
+    clients = [threading.Thread(target=client) for _ in range(50)]
+    for t in clients:
+        t.start()
+
+    append(log_file, "tests/test_app.py::test_a FAILED\n")
+    broadcaster.poll()
+    for t in clients:
+        t.join()
+
+    assert len(reads) == 1
+    assert len(results) == 50
+    assert all(event["new_failures"] == ["tests/test_app.py::test_a"] for _, event in results)
+
+
+def test_broadcaster_only_sends_unseen_failures(log_file):
+    """✅ Clients receive each failing test name once."""
+    broadcaster = ProgressBroadcaster(str(log_file))
+    append(log_file, "tests/test_app.py::test_a FAILED\n")
+    broadcaster.poll()
+    seq, event = broadcaster.wait(-1)
+    run, seen = event["run"], event["total_failures"]
+
+    append(log_file, "tests/test_app.py::test_b ERROR\n")
+    broadcaster.poll()
+    _, event = broadcaster.wait(seq, run, seen, timeout=1)
+    assert event["new_failures"] == ["tests/test_app.py::test_b"]
+    assert not event["snapshot"]
+    assert event["counts"]["failed"] == 1
+    assert event["counts"]["error"] == 1
+
+
+def test_get_broadcaster_is_shared(log_file):
+    """✅ All clients of the same log reuse one broadcaster."""
+    first = live_progress.get_broadcaster(str(log_file))
+    assert live_progress.get_broadcaster(str(log_file)) is first
+
+
+def test_events_stream_requires_login():
+    """✅ The event stream is not available to anonymous users."""
+    app.config["TESTING"] = True
+    with app.test_client() as client:
+        rv = client.get("/dashboard/events")
+        assert rv.status_code == 302
+
+
+def test_events_stream_sends_progress(log_file, monkeypatch):
+    """✅ A logged-in client gets the current counts as a server-sent event."""
+    append(log_file, "tests/test_app.py ..F\n")
+    app.config["TESTING"] = True
+    monkeypatch.setitem(app.config, "PYTEST_LOG", str(log_file))
+    with app.test_client() as client:
+        client.post("/login", data={"username": "alice", "password": "password123"})
+        assert b"EventSource" in client.get("/dashboard/live").data
+
+        rv = client.get("/dashboard/events", buffered=False)
+        assert rv.mimetype == "text/event-stream"
+        chunk = next(rv.response)
+        rv.close()
+
+    chunk = chunk.decode() if isinstance(chunk, bytes) else chunk
+    assert chunk.startswith("event: progress")
+    assert '"passed": 2' in chunk
+    assert '"failed": 1' in chunk
+
+
+def test_events_stream_reconnect_starts_with_snapshot(log_file, monkeypatch):
+    """✅ Every new connection first gets a full snapshot, so a reconnect does not duplicate failures."""
+    append(log_file, "tests/test_app.py::test_a FAILED\n")
+    app.config["TESTING"] = True
+    monkeypatch.setitem(app.config, "PYTEST_LOG", str(log_file))
+    events = []
+    with app.test_client() as client:
+        client.post("/login", data={"username": "alice", "password": "password123"})
+        for _ in range(2):
+            rv = client.get("/dashboard/events", buffered=False)
+            chunk = next(rv.response)
+            rv.close()
+            chunk = chunk.decode() if isinstance(chunk, bytes) else chunk
+            events.append(json.loads(chunk.split("data: ", 1)[1]))
+
+    first, second = events
+    assert first["snapshot"] and second["snapshot"]
+    assert second["run"] == first["run"]
+    assert second["new_failures"] == ["tests/test_app.py::test_a"]